@@ -1,16 +1,3 @@
-import graphene
-from crm.schema import Query as CRMQuery, Mutation as CRMMutation
-
-
-class Query(CRMQuery, graphene.ObjectType):
-    hello = graphene.String(description="A friendly greeting")
-
-    def resolve_hello(root, info):
-        return "Hello, GraphQL!"
-
-
-class Mutation(CRMMutation, graphene.ObjectType):
-    pass
-
-
-schema = graphene.Schema(query=Query, mutation=Mutation)
+# The CRM app owns the one schema (GRAPHENE["SCHEMA"] points at it);
+# re-export it here instead of building a second graphene.Schema.
+from crm.schema import Query, Mutation, schema  # noqa: F401
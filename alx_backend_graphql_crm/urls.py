@@ -20,8 +20,22 @@ from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.conf.urls.static import static
+from graphql.validation import specified_rules
+
+from crm.validation import cost_limit_validator, depth_limit_validator
+
+# Passing rules replaces graphql-core's defaults, so keep the spec rules
+# and add depth and cost caps that reject runaway queries before any
+# resolver runs
+GRAPHQL_VALIDATION_RULES = (
+    *specified_rules,
+    depth_limit_validator(max_depth=7),
+    cost_limit_validator(
+        max_cost=getattr(settings, "CRM_GRAPHQL_MAX_COST", 1000)),
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("graphql", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("graphql", csrf_exempt(GraphQLView.as_view(
+        graphiql=True, validation_rules=GRAPHQL_VALIDATION_RULES))),
 ] + static(settings.STATIC_URL, document_root=None)
@@ -1,52 +1,84 @@
 import datetime
 import requests
+from django.db import connection
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from gql.transport.requests import RequestsHTTPTransport
 from gql import gql, Client
 
+HEARTBEAT_LOG = "/tmp/crm_heartbeat_log.txt"
+
+# Shared session so repeated pings reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2),
+))
+
+# Fixed query: parse once, and skip schema introspection on every ping
+_CLIENT = Client(
+    transport=RequestsHTTPTransport(
+        url="http://localhost:8000/graphql",
+        verify=True,
+        retries=3,
+    ),
+    fetch_schema_from_transport=False,
+)
+_HELLO_Q = gql("{ hello }")
+
 
 def log_crm_heartbeat():
     """
     Logs heartbeat into /tmp/crm_heartbeat_log.txt.
     Format: DD/MM/YYYY-HH:MM:SS CRM is alive
-    Also pings GraphQL { hello } endpoint via requests and gql client.
+            DD/MM/YYYY-HH:MM:SS Database ping OK|FAILED
+    Liveness is a plain SELECT 1 on the database; the GraphQL endpoint
+    is exercised separately (and less often) by graphql_smoke_test.
     """
     now_str = datetime.datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
-    log_file = "/tmp/crm_heartbeat_log.txt"
 
-    # Always log heartbeat
-    with open(log_file, "a", encoding="utf-8") as f:
+    try:
+        with connection.cursor() as c:
+            c.execute("SELECT 1")
+            db_ok = c.fetchone() == (1,)
+    except Exception:
+        db_ok = False
+
+    with open(HEARTBEAT_LOG, "a", encoding="utf-8") as f:
         f.write(f"{now_str} CRM is alive\n")
+        f.write(f"{now_str} Database ping {'OK' if db_ok else 'FAILED'}\n")
+
+
+def graphql_smoke_test():
+    """
+    Pings GraphQL { hello } via requests and gql client.
+    Results are appended to the heartbeat log.
+    """
+    now_str = datetime.datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
+    lines = []
 
     # --- Raw requests ping ---
     try:
-        r = requests.post(
+        r = _SESSION.post(
             "http://localhost:8000/graphql",
             json={"query": "{ hello }"},
             timeout=5,
         )
         if r.ok:
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write("GraphQL hello (requests) OK\n")
+            lines.append(f"{now_str} GraphQL hello (requests) OK\n")
     except Exception:
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write("GraphQL hello (requests) FAILED\n")
+        lines.append(f"{now_str} GraphQL hello (requests) FAILED\n")
 
     # --- gql client ping ---
     try:
-        transport = RequestsHTTPTransport(
-            url="http://localhost:8000/graphql",
-            verify=True,
-            retries=3,
-        )
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        gql_query = gql("{ hello }")
-        gql_result = client.execute(gql_query)
-
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(f"GraphQL hello (gql client) OK: {gql_result}\n")
+        gql_result = _CLIENT.execute(_HELLO_Q)
+        lines.append(f"{now_str} GraphQL hello (gql client) OK: {gql_result}\n")
     except Exception:
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write("GraphQL hello (gql client) FAILED\n")
+        lines.append(f"{now_str} GraphQL hello (gql client) FAILED\n")
+
+    with open(HEARTBEAT_LOG, "a", encoding="utf-8") as f:
+        f.writelines(lines)
 
 
 def update_low_stock():
@@ -67,8 +99,7 @@ def update_low_stock():
     ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     try:
-        import requests
-        r = requests.post(
+        r = _SESSION.post(
             "http://localhost:8000/graphql",
             json={"query": mutation},
             timeout=10,
@@ -8,45 +8,51 @@ from gql.transport.requests import RequestsHTTPTransport
 
 GRAPHQL_URL = "http://localhost:8000/graphql"
 LOG_FILE = Path("/tmp/order_reminders_log.txt")
+PAGE_SIZE = 500
 
 client = Client(
     transport=RequestsHTTPTransport(url=GRAPHQL_URL, timeout=10),
     fetch_schema_from_transport=False
 )
 
+# The server filters by date, so only the last week's orders come back
 query = gql("""
-query {
-  orders {
+query ($since: DateTime!, $first: Int!, $offset: Int!) {
+  allOrders(orderDateGte: $since, first: $first, offset: $offset) {
     id
     orderDate
-    status
     customer { email }
   }
 }
 """)
 
 
-def is_recent(dt_str: str) -> bool:
-    try:
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-        return dt >= datetime.now(timezone.utc) - timedelta(days=7)
-    except Exception:
-        return False
-
-
 def main():
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    orders = client.execute(query).get("orders", [])
+    since = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+    orders = []
+
+    # One session (and connection) for every page
+    with client as session:
+        offset = 0
+        while True:
+            page = session.execute(query, variable_values={
+                "since": since, "first": PAGE_SIZE, "offset": offset,
+            }).get("allOrders") or []
+            orders.extend(page)
+            if len(page) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
 
     reminders = [
         f"{now} Reminder -> Order {o.get('id')} / {(o.get('customer') or {}).get('email', 'unknown@example.com')}"
         for o in orders
-        if o and is_recent(o.get("orderDate", ""))
+        if o
     ]
 
     if reminders:
-        LOG_FILE.write_text("\n".join(reminders) + "\n",
-                            encoding="utf-8", append=True)
+        with LOG_FILE.open("a", encoding="utf-8", buffering=64 * 1024) as fh:
+            fh.write("\n".join(reminders) + "\n")
 
     print("Order reminders processed!")
 
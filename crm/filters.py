@@ -77,7 +77,11 @@ class OrderFilter(df.FilterSet):
             "customer_name", "product_name", "product_id",
         ]
 
-    # Avoid duplicates from M2M joins
+    # Avoid duplicates from M2M joins; only product filters join products
     @property
     def qs(self):
-        return super().qs.distinct()
+        qs = super().qs
+        data = getattr(self.form, "cleaned_data", {})
+        if data.get("product_name") or data.get("product_id") is not None:
+            return qs.distinct()
+        return qs
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def lowercase_emails(apps, schema_editor):
+    """
+    Store every customer email lowercased, so exact lookups on the unique
+    index behave case-insensitively. A row whose lowercased email already
+    belongs to another customer is left as is; those duplicates predate
+    this migration and need merging by hand.
+    """
+    Customer = apps.get_model("crm", "Customer")
+    emails = set(Customer.objects.values_list("email", flat=True))
+    for pk, email in Customer.objects.values_list("pk", "email"):
+        lowered = email.lower()
+        if lowered == email or lowered in emails:
+            continue
+        Customer.objects.filter(pk=pk).update(email=lowered)
+        emails.discard(email)
+        emails.add(lowered)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0002_order_ord_cust_date_idx_order_ord_date_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
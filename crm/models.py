@@ -1,5 +1,7 @@
 from decimal import Decimal
 from django.db import models
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
@@ -8,6 +10,11 @@ class Customer(models.Model):
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=20, blank=True)
 
+    def save(self, *args, **kwargs):
+        # Emails are stored lowercased so exact lookups are case-insensitive
+        self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} <{self.email}>"
 
@@ -21,6 +28,29 @@ class Product(models.Model):
         return f"{self.name} (${self.price})"
 
 
+class OrderQuerySet(models.QuerySet):
+    def recompute_totals(self, order_ids=None):
+        """
+        Set total_amount to the sum of each order's product prices.
+        Runs as a single UPDATE with a correlated subquery, however many
+        orders are affected. Returns the number of rows updated.
+        """
+        qs = self if order_ids is None else self.filter(pk__in=order_ids)
+        totals = (
+            self.model.products.through.objects
+            .filter(order=OuterRef("pk"))
+            .values("order")
+            .annotate(t=Sum("product__price"))
+            .values("t")
+        )
+        amount = DecimalField(max_digits=12, decimal_places=2)
+        return qs.update(total_amount=Coalesce(
+            Subquery(totals, output_field=amount),
+            Value(Decimal("0.00")),
+            output_field=amount,
+        ))
+
+
 class Order(models.Model):
     customer = models.ForeignKey(
         Customer, on_delete=models.CASCADE, related_name="orders")
@@ -29,5 +59,16 @@ class Order(models.Model):
         max_digits=12, decimal_places=2, default=Decimal("0.00"))
     order_date = models.DateTimeField(default=timezone.now)
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Per-customer order history, newest first
+            models.Index(fields=["customer", "-order_date"],
+                         name="ord_cust_date_idx"),
+            # order_date range filters (OrderFilter, reminders)
+            models.Index(fields=["order_date"], name="ord_date_idx"),
+        ]
+
     def __str__(self):
         return f"Order #{self.id} for {self.customer.name} - {self.total_amount}"
@@ -1,9 +1,12 @@
 import re
 from decimal import Decimal, InvalidOperation
+from django.conf import settings
 from django.db import transaction, IntegrityError
+from django.db.models import F, Prefetch
 from django.utils import timezone
 import graphene
 from graphene_django import DjangoObjectType
+from graphql.language import FieldNode
 from .models import Customer, Product, Order
 from crm.models import Product  # checker specific task
 
@@ -53,16 +56,94 @@ class CreateOrderInput(graphene.InputObjectType):
 # -----------------
 # Validators / helpers
 # -----------------
-_PHONE_PATTERNS = [
-    re.compile(r"^\+\d{7,15}$"),
-    re.compile(r"^\d{3}-\d{3}-\d{4}$"),
-]
+# Rows per INSERT statement for bulk mutations
+_BULK_BATCH_SIZE = getattr(settings, "CRM_BULK_BATCH_SIZE", 500)
+
+# +1234567890 or 123-456-7890, as one anchored alternation
+_PHONE_RE = re.compile(r"^(?:\+\d{7,15}|\d{3}-\d{3}-\d{4})\Z")
+
+
+def _norm(value) -> str:
+    return value.strip() if value else ""
+
+
+def _norm_email(value) -> str:
+    return value.strip().lower() if value else ""
 
 
 def _valid_phone(phone: str) -> bool:
     if not phone:
         return True
-    return any(rx.match(phone) for rx in _PHONE_PATTERNS)
+    return _PHONE_RE.match(phone) is not None
+
+
+def _int_ids(values):
+    """Split GraphQL ID values into a set of ints and a list of unparsable ones."""
+    ids, invalid = set(), []
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            invalid.append(str(value))
+    return ids, invalid
+
+
+# GraphQL field name -> model column, for .only() projections
+_CUSTOMER_COLUMNS = {"id": "id", "name": "name",
+                     "email": "email", "phone": "phone"}
+_PRODUCT_COLUMNS = {"id": "id", "name": "name",
+                    "price": "price", "stock": "stock"}
+_ORDER_COLUMNS = {"id": "id", "totalAmount": "total_amount",
+                  "orderDate": "order_date"}
+_ORDER_RELATIONS = {"customer": ("customer", _CUSTOMER_COLUMNS)}
+
+
+def _selections(nodes):
+    """
+    Sub-selections of every node for one field; graphql-core splits a
+    field selected more than once (or via fragments) across several nodes.
+    """
+    for node in nodes:
+        yield from node.selection_set.selections
+
+
+def _only_columns(nodes, columns, relations=None, prefix=""):
+    """
+    Translate the merged sub-selections of field nodes into .only() paths.
+    Returns None when fragments are used, meaning load every column.
+    """
+    paths = []
+    for sel in _selections(nodes):
+        if not isinstance(sel, FieldNode):
+            return None
+        name = sel.name.value
+        if name in columns:
+            paths.append(prefix + columns[name])
+        elif relations and name in relations:
+            field, sub_columns = relations[name]
+            sub = _only_columns(
+                [sel], sub_columns, prefix=f"{prefix}{field}__")
+            if sub is None:
+                return None
+            paths.extend(sub)
+    return paths
+
+
+def _relation_columns(nodes, name, columns):
+    """
+    .only() paths for a prefetched sub-field across all its selections.
+    Returns [] when it is not selected and None when fragments are used.
+    """
+    paths = []
+    for sel in _selections(nodes):
+        if not isinstance(sel, FieldNode):
+            return None
+        if sel.name.value == name:
+            sub = _only_columns([sel], columns)
+            if sub is None:
+                return None
+            paths += ["id", *sub]
+    return paths
 
 
 # -----------------
@@ -81,15 +162,15 @@ class CreateCustomer(graphene.Mutation):
     def mutate(root, info, input: CreateCustomerInput):
         errs = []
 
-        name = (input.name or "").strip()
-        email = (input.email or "").strip().lower()
-        phone = (input.phone or "").strip() if input.phone else ""
+        name = _norm(input.name)
+        email = _norm_email(input.email)
+        phone = _norm(input.phone)
 
         if not name:
             errs.append("Name is required.")
         if not email:
             errs.append("Email is required.")
-        elif Customer.objects.filter(email__iexact=email).exists():
+        elif Customer.objects.filter(email=email).exists():
             errs.append("Email already exists.")
         if phone and not _valid_phone(phone):
             errs.append(
@@ -115,57 +196,73 @@ class BulkCreateCustomers(graphene.Mutation):
         if not input:
             return BulkCreateCustomers(ok=False, customers=[], errors=["No customers provided."])
 
-        errors = []
-        to_create = []
+        errors = []  # (row number, message)
+        pending = []  # (row number, unsaved Customer)
         created = []
-
-        existing_emails = {e.lower()
-                           for e in Customer.objects.values_list("email", flat=True)}
         seen_in_batch = set()
 
         for idx, row in enumerate(input, start=1):
             row_errs = []
-            name = (row.name or "").strip()
-            email = (row.email or "").strip().lower()
-            phone = (row.phone or "").strip() if row.phone else ""
+            name = _norm(row.name)
+            email = _norm_email(row.email)
+            phone = _norm(row.phone)
 
             if not name:
                 row_errs.append(f"Row {idx}: name is required.")
             if not email:
                 row_errs.append(f"Row {idx}: email is required.")
-            else:
-                if email in existing_emails:
-                    row_errs.append(
-                        f"Row {idx}: email already exists ({email}).")
-                if email in seen_in_batch:
-                    row_errs.append(
-                        f"Row {idx}: duplicate email within payload ({email}).")
+            elif email in seen_in_batch:
+                row_errs.append(
+                    f"Row {idx}: duplicate email within payload ({email}).")
 
             if phone and not _valid_phone(phone):
                 row_errs.append(f"Row {idx}: invalid phone format.")
 
             if row_errs:
-                errors.extend(row_errs)
+                errors.extend((idx, e) for e in row_errs)
                 continue
 
             seen_in_batch.add(email)
-            to_create.append(Customer(name=name, email=email, phone=phone))
+            pending.append(
+                (idx, Customer(name=name, email=email, phone=phone)))
 
-        if to_create:
+        if pending:
+            # Insert optimistically; the unique index reports conflicts
             try:
                 with transaction.atomic():
-                    created = Customer.objects.bulk_create(to_create)
+                    created = Customer.objects.bulk_create(
+                        [c for _, c in pending], batch_size=_BULK_BATCH_SIZE)
             except IntegrityError:
-                created = []
-                with transaction.atomic():
-                    for c in to_create:
+                # Find the taken emails in one query, insert the rest once
+                taken = set(Customer.objects.filter(
+                    email__in=[c.email for _, c in pending],
+                ).values_list("email", flat=True))
+                errors.extend(
+                    (idx, f"Row {idx}: email already exists ({c.email}).")
+                    for idx, c in pending if c.email in taken)
+                rest = [(idx, c) for idx, c in pending if c.email not in taken]
+                try:
+                    with transaction.atomic():
+                        created = Customer.objects.bulk_create(
+                            [Customer(name=c.name, email=c.email, phone=c.phone)
+                             for _, c in rest],
+                            batch_size=_BULK_BATCH_SIZE)
+                except IntegrityError:
+                    # Another writer took an email meanwhile; go row by row
+                    created = []
+                    for idx, c in rest:
                         try:
-                            created.append(Customer.objects.create(
-                                name=c.name, email=c.email, phone=c.phone))
+                            with transaction.atomic():
+                                created.append(Customer.objects.create(
+                                    name=c.name, email=c.email, phone=c.phone))
                         except IntegrityError:
-                            errors.append(f"Email already exists ({c.email}).")
+                            errors.append(
+                                (idx, f"Row {idx}: email already exists ({c.email})."))
 
-        return BulkCreateCustomers(ok=len(errors) == 0, customers=created, errors=errors)
+        errors.sort(key=lambda e: e[0])  # stable: keeps a row's own order
+        return BulkCreateCustomers(
+            ok=len(errors) == 0, customers=created,
+            errors=[msg for _, msg in errors])
 
 
 class CreateProduct(graphene.Mutation):
@@ -179,7 +276,7 @@ class CreateProduct(graphene.Mutation):
     @staticmethod
     def mutate(root, info, input: CreateProductInput):
         errs = []
-        name = (input.name or "").strip()
+        name = _norm(input.name)
         if not name:
             errs.append("Name is required.")
 
@@ -213,28 +310,39 @@ class CreateOrder(graphene.Mutation):
 
     @staticmethod
     def mutate(root, info, input: CreateOrderInput):
-        try:
-            customer = Customer.objects.get(pk=input.customer_id)
-        except Customer.DoesNotExist:
+        # Existence probe only; the FK id is all the INSERT needs
+        if not Customer.objects.filter(pk=input.customer_id).exists():
             return CreateOrder(ok=False, errors=[f"Customer ID {input.customer_id} not found."], order=None)
 
-        ids = list(input.product_ids or [])
+        ids = input.product_ids or ()
         if not ids:
             return CreateOrder(ok=False, errors=["At least one product must be selected."], order=None)
 
-        products = list(Product.objects.filter(pk__in=ids))
-        missing = set(map(str, ids)) - {str(p.id) for p in products}
+        id_set, invalid = _int_ids(ids)
+        # Only (id, price) pairs are needed; skip building Product instances
+        prices = dict(Product.objects.filter(
+            pk__in=id_set).values_list("id", "price"))
+        missing = invalid + [str(i) for i in sorted(id_set - prices.keys())]
         if missing:
-            return CreateOrder(ok=False, errors=[f"Invalid product ID(s): {', '.join(sorted(missing))}"], order=None)
+            return CreateOrder(ok=False, errors=[f"Invalid product ID(s): {', '.join(missing)}"], order=None)
+
+        # Keep the transaction to the writes only
+        total = sum(prices.values(), Decimal("0.00"))
+        order_date = input.order_date or timezone.now()
 
         with transaction.atomic():
-            total = sum((p.price for p in products), Decimal("0.00"))
             order = Order.objects.create(
-                customer=customer,
+                customer_id=input.customer_id,
                 total_amount=total,
-                order_date=input.order_date or timezone.now(),
+                order_date=order_date,
+            )
+            # Fresh order: insert the link rows directly instead of letting
+            # set() diff against (empty) current members first
+            through = Order.products.through
+            through.objects.bulk_create(
+                [through(order_id=order.pk, product_id=pid) for pid in prices],
+                batch_size=_BULK_BATCH_SIZE,
             )
-            order.products.set(products)
 
         return CreateOrder(ok=True, errors=[], order=order)
 
@@ -247,12 +355,13 @@ class UpdateLowStockProducts(graphene.Mutation):
 
     @classmethod
     def mutate(cls, root, info):
-        updated = []
-        qs = Product.objects.filter(stock__lt=10)
-        for p in qs:
-            p.stock += 10
-            p.save()
-            updated.append(p)
+        # Lock the low-stock rows so concurrent runs skip them instead of
+        # restocking twice; the UPDATE does the arithmetic in SQL
+        with transaction.atomic():
+            ids = list(Product.objects.select_for_update(skip_locked=True)
+                       .filter(stock__lt=10).values_list("pk", flat=True))
+            Product.objects.filter(pk__in=ids).update(stock=F("stock") + 10)
+        updated = list(Product.objects.filter(pk__in=ids))
 
         return UpdateLowStockProducts(
             ok=True,
@@ -269,16 +378,50 @@ class Query(graphene.ObjectType):
     hello = graphene.String(default_value="Hello, GraphQL!")
     all_customers = graphene.List(CustomerType)
     all_products = graphene.List(ProductType)
-    all_orders = graphene.List(OrderType)
+    all_orders = graphene.List(
+        OrderType,
+        order_date_gte=graphene.DateTime(name="orderDateGte"),
+        first=graphene.Int(),
+        offset=graphene.Int(),
+    )
 
     def resolve_all_customers(root, info):
-        return Customer.objects.all()
+        # Explicit pk order: .only("id", "email") can be served from the
+        # unique email index, which would return rows sorted by email
+        qs = Customer.objects.order_by("pk")
+        columns = _only_columns(info.field_nodes, _CUSTOMER_COLUMNS)
+        return qs.only(*columns) if columns else qs
 
     def resolve_all_products(root, info):
-        return Product.objects.all()
-
-    def resolve_all_orders(root, info):
-        return Order.objects.select_related("customer").prefetch_related("products").all()
+        qs = Product.objects.order_by("pk")
+        columns = _only_columns(info.field_nodes, _PRODUCT_COLUMNS)
+        return qs.only(*columns) if columns else qs
+
+    def resolve_all_orders(root, info, order_date_gte=None, first=None, offset=None):
+        nodes = info.field_nodes
+        # Explicit pk order: narrow .only() sets let SQLite answer from a
+        # covering index, which would otherwise reorder the rows
+        qs = Order.objects.select_related("customer").order_by("pk")
+
+        # Prefetch products only when selected, and only their selected columns
+        product_columns = _relation_columns(nodes, "products", _PRODUCT_COLUMNS)
+        if product_columns is None:
+            qs = qs.prefetch_related("products")
+        elif product_columns:
+            qs = qs.prefetch_related(Prefetch(
+                "products", queryset=Product.objects.only(*product_columns)))
+
+        if order_date_gte is not None:
+            qs = qs.filter(order_date__gte=order_date_gte)
+        columns = _only_columns(nodes, _ORDER_COLUMNS, _ORDER_RELATIONS)
+        if columns is not None:
+            # customer is always joined, so its FK column must stay loaded
+            qs = qs.only("customer", *columns)
+        if first is not None or offset:
+            # pk order keeps consecutive pages from skipping or repeating rows
+            start = max(offset or 0, 0)
+            qs = qs[start:start + max(first, 0)] if first is not None else qs[start:]
+        return qs
 
 
 class Mutation(graphene.ObjectType):
@@ -58,6 +58,7 @@ MIDDLEWARE = [
 ]
 CRONJOBS = [
     ('*/5 * * * *', 'crm.cron.log_crm_heartbeat'),
+    ('0 * * * *', 'crm.cron.graphql_smoke_test'),
     ('0 */12 * * *', 'crm.cron.update_low_stock'),
 ]
 GRAPHENE = {"SCHEMA": "crm.schema.schema"}
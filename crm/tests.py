@@ -1,3 +1,99 @@
+import time
+
 from django.test import TestCase
 
-# Create your tests here.
+from crm.models import Customer, Order
+from crm.schema import schema
+
+
+class GraphQLValidationTests(TestCase):
+    """Depth and cost limits installed on the /graphql endpoint."""
+
+    def post(self, query):
+        return self.client.post(
+            "/graphql", {"query": query}, content_type="application/json")
+
+    def messages(self, response):
+        return [e["message"] for e in response.json().get("errors", [])]
+
+    def test_cyclic_fragment_is_a_validation_error(self):
+        response = self.post("{ ...F } fragment F on Query { ...F }")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "Cannot spread fragment 'F' within itself.",
+            self.messages(response))
+
+    def test_deep_query_is_rejected(self):
+        response = self.post(
+            "query Deep { allOrders { customer "
+            "{ a { b { c { d { e { f { g } } } } } } } } }")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "'Deep' exceeds maximum operation depth of 7.",
+            self.messages(response))
+
+    def test_costly_query_is_rejected(self):
+        orders = "allOrders { products { id name price stock } }"
+        aliased = " ".join(f"o{i}: {orders}" for i in range(5))
+        response = self.post(f"query Costly {{ {aliased} }}")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "'Costly' exceeds maximum query cost of 1000.",
+            self.messages(response))
+
+    def test_ordinary_query_is_accepted(self):
+        response = self.post(
+            "{ allOrders { id totalAmount customer { email } "
+            "products { name price } } }")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"data": {"allOrders": []}})
+
+    def test_fragment_fan_out_validates_quickly(self):
+        # Each fragment spreads the next twice: 2**40 paths if re-walked
+        levels = 40
+        fragments = " ".join(
+            f"fragment F{i} on Query {{ ...F{i + 1} ...F{i + 1} }}"
+            for i in range(levels))
+        query = (f"query FanOut {{ ...F0 }} {fragments} "
+                 f"fragment F{levels} on Query {{ allOrders {{ id }} }}")
+
+        started = time.perf_counter()
+        response = self.post(query)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "'FanOut' exceeds maximum query cost of 1000.",
+            self.messages(response))
+
+
+class ListOrderingTests(TestCase):
+    """Column projections must not change the order of list queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customers = [
+            Customer.objects.create(name=name, email=f"{name}@example.com")
+            for name in ("zed", "amy", "mo")]
+        zed, amy, mo = cls.customers
+        cls.orders = [
+            Order.objects.create(customer=c) for c in (amy, zed, amy, zed, mo)]
+
+    def data(self, query):
+        result = schema.execute(query)
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def test_orders_keep_pk_order_for_any_selection(self):
+        expected = [str(o.pk) for o in self.orders]
+        data = self.data("{ a: allOrders { id } b: allOrders { id totalAmount } }")
+        self.assertEqual([o["id"] for o in data["a"]], expected)
+        self.assertEqual([o["id"] for o in data["b"]], expected)
+
+    def test_customers_keep_pk_order_for_any_selection(self):
+        expected = [c.email for c in self.customers]
+        data = self.data(
+            "{ a: allCustomers { email } b: allCustomers { name email } }")
+        self.assertEqual([c["email"] for c in data["a"]], expected)
+        self.assertEqual([c["email"] for c in data["b"]], expected)
@@ -0,0 +1,143 @@
+from graphql import GraphQLError, get_named_type, get_nullable_type, is_list_type
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.validation import ValidationRule
+
+# A list field is assumed to return this many items when costing a query
+LIST_FACTOR = 10
+
+
+def _selection_cost(context, selection_set, parent_type, multiplier,
+                    limit, fragments):
+    """
+    Cost of a selection set: 1 per scalar/object field and LIST_FACTOR per
+    list field, both scaled by how many times the parent is resolved.
+    Stops adding once the running cost exceeds limit.
+    """
+    cost = 0
+    for sel in selection_set.selections:
+        if isinstance(sel, FieldNode):
+            name = sel.name.value
+            fields = getattr(parent_type, "fields", None) or {}
+            if name.startswith("__") or name not in fields:
+                continue  # introspection, or reported by FieldsOnCorrectType
+            field_type = get_nullable_type(fields[name].type)
+            if is_list_type(field_type):
+                multiplier_here = multiplier * LIST_FACTOR
+            else:
+                multiplier_here = multiplier
+            cost += multiplier_here
+            if sel.selection_set and cost <= limit:
+                cost += _selection_cost(
+                    context, sel.selection_set, get_named_type(field_type),
+                    multiplier_here, limit, fragments)
+        elif isinstance(sel, InlineFragmentNode):
+            type_ = parent_type
+            if sel.type_condition:
+                type_ = context.schema.get_type(sel.type_condition.name.value)
+            cost += _selection_cost(
+                context, sel.selection_set, type_, multiplier, limit, fragments)
+        elif isinstance(sel, FragmentSpreadNode):
+            cost += multiplier * _fragment_cost(
+                context, sel.name.value, limit, fragments)
+        if cost > limit:
+            break
+    return cost
+
+
+def _fragment_cost(context, name, limit, fragments):
+    """
+    Cost of a named fragment at multiplier 1, computed once per operation.
+    Cost is linear in the multiplier, so spreads scale the cached value.
+    """
+    if name not in fragments:
+        fragments[name] = 0  # in progress: cyclic spreads add nothing
+        fragment = context.get_fragment(name)
+        if fragment is not None:  # unknown names are reported elsewhere
+            type_ = context.schema.get_type(fragment.type_condition.name.value)
+            fragments[name] = _selection_cost(
+                context, fragment.selection_set, type_, 1, limit, fragments)
+    return fragments[name]
+
+
+def _selection_depth(context, selection_set, depth, limit, fragments):
+    """
+    Deepest field nesting below selection_set; top-level fields are 0.
+    Returns as soon as the depth found exceeds limit.
+    """
+    deepest = depth
+    for sel in selection_set.selections:
+        if isinstance(sel, FieldNode):
+            if sel.name.value.startswith("__") or not sel.selection_set:
+                continue
+            found = _selection_depth(
+                context, sel.selection_set, depth + 1, limit, fragments)
+        elif isinstance(sel, InlineFragmentNode):
+            found = _selection_depth(
+                context, sel.selection_set, depth, limit, fragments)
+        elif isinstance(sel, FragmentSpreadNode):
+            found = depth + _fragment_depth(
+                context, sel.name.value, limit, fragments)
+        else:
+            continue
+        deepest = max(deepest, found)
+        if deepest > limit:
+            break
+    return deepest
+
+
+def _fragment_depth(context, name, limit, fragments):
+    """Depth a named fragment adds below its spread, computed once."""
+    if name not in fragments:
+        fragments[name] = 0  # in progress: cyclic spreads add nothing
+        fragment = context.get_fragment(name)
+        if fragment is not None:  # unknown names are reported elsewhere
+            fragments[name] = _selection_depth(
+                context, fragment.selection_set, 0, limit, fragments)
+    return fragments[name]
+
+
+def depth_limit_validator(max_depth):
+    """
+    Validation rule rejecting operations nested deeper than max_depth.
+    Unlike graphene's rule of the same name, cyclic fragments are skipped
+    instead of recursing until RecursionError.
+    """
+    class DepthLimitValidator(ValidationRule):
+        def enter_operation_definition(self, node, *_args):
+            depth = _selection_depth(
+                self.context, node.selection_set, 0, max_depth, {})
+            if depth > max_depth:
+                name = node.name.value if node.name else "anonymous"
+                self.report_error(GraphQLError(
+                    f"'{name}' exceeds maximum operation depth of {max_depth}.",
+                    [node],
+                ))
+
+    return DepthLimitValidator
+
+
+def cost_limit_validator(max_cost):
+    """
+    Validation rule rejecting operations whose estimated cost exceeds
+    max_cost, so nested list queries fail before any resolver runs.
+    """
+    class CostLimitValidator(ValidationRule):
+        def enter_operation_definition(self, node, *_args):
+            schema = self.context.schema
+            root_type = {
+                "query": schema.query_type,
+                "mutation": schema.mutation_type,
+                "subscription": schema.subscription_type,
+            }[node.operation.value]
+            if root_type is None:
+                return
+            cost = _selection_cost(
+                self.context, node.selection_set, root_type, 1, max_cost, {})
+            if cost > max_cost:
+                name = node.name.value if node.name else "anonymous"
+                self.report_error(GraphQLError(
+                    f"'{name}' exceeds maximum query cost of {max_cost}.",
+                    [node],
+                ))
+
+    return CostLimitValidator
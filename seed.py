@@ -1,40 +1,46 @@
 """
 Usage:
-    python seed_db.py
+    python seed.py
 """
-from crm.models import Customer, Product, Order
 from decimal import Decimal
 import os
 import django
 
 # Point to your Django settings module
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "graphql_crm.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings")
 django.setup()
 
+from django.db import transaction  # noqa: E402
+from crm.models import Customer, Product, Order  # noqa: E402
+
 
 def run():
-    # Customers
-    c1, _ = Customer.objects.get_or_create(
-        name="Alice", email="alice@example.com", defaults={"phone": "+1234567890"})
-    c2, _ = Customer.objects.get_or_create(
-        name="Bob", email="bob@example.com", defaults={"phone": "123-456-7890"})
-
-    # Products
-    p1, _ = Product.objects.get_or_create(
-        name="Laptop", defaults={"price": Decimal("999.99"), "stock": 10})
-    p2, _ = Product.objects.get_or_create(
-        name="Phone", defaults={"price": Decimal("499.50"), "stock": 25})
-    p3, _ = Product.objects.get_or_create(name="Headphones", defaults={
-                                          "price": Decimal("79.90"), "stock": 50})
-
-    # One sample order
-    if not Order.objects.exists():
-        o = Order.objects.create(customer=c1, total_amount=Decimal("0.00"))
-        o.products.set([p1, p3])
-        # Recalculate total
-        o.total_amount = sum(
-            (x.price for x in o.products.all()), Decimal("0.00"))
-        o.save()
+    with transaction.atomic():
+        # Customers: email is unique, so rows already seeded are skipped
+        Customer.objects.bulk_create([
+            Customer(name="Alice", email="alice@example.com", phone="+1234567890"),
+            Customer(name="Bob", email="bob@example.com", phone="123-456-7890"),
+        ], ignore_conflicts=True)
+
+        # Products have no unique key; insert only the names still missing
+        products = [
+            Product(name="Laptop", price=Decimal("999.99"), stock=10),
+            Product(name="Phone", price=Decimal("499.50"), stock=25),
+            Product(name="Headphones", price=Decimal("79.90"), stock=50),
+        ]
+        existing = set(Product.objects.filter(
+            name__in=[p.name for p in products]).values_list("name", flat=True))
+        Product.objects.bulk_create(
+            [p for p in products if p.name not in existing])
+
+        # One sample order
+        if not Order.objects.exists():
+            c1 = Customer.objects.get(email="alice@example.com")
+            o = Order.objects.create(customer=c1)
+            o.products.set(Product.objects.filter(
+                name__in=["Laptop", "Headphones"]))
+            # Recalculate total in the database (one UPDATE)
+            Order.objects.recompute_totals([o.pk])
 
     print("Seed complete.")
     print(